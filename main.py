@@ -6,15 +6,20 @@ compare tax regimes and save on taxes.
 
 import streamlit as st
 import io
-from datetime import date
+import numpy as np
+from datetime import date, datetime
 from tax_calculator import (
-    calculate_old_regime_tax,
-    calculate_new_regime_tax,
+    UserData,
+    calculate_old_regime_tax_vec,
     get_tax_saving_tips,
     get_better_regime
 )
-from pdf_generator import generate_tax_report
-from tax_predictor import TaxRegimePredictor
+
+# Prefer the compiled slab calculations when the Cython module has been built
+try:
+    from tax_calc_c import calculate_old_regime_tax, calculate_new_regime_tax
+except ImportError:
+    from tax_calculator import calculate_old_regime_tax, calculate_new_regime_tax
 
 # Page configuration
 st.set_page_config(
@@ -24,8 +29,108 @@ st.set_page_config(
     page_icon="🧾"
 )
 
-# Initialize the ML predictor
-ml_predictor = TaxRegimePredictor()
+# Initialize the ML predictor once and share it across reruns and sessions;
+# tax_predictor (and its ML stack) is only imported when first needed
+@st.cache_resource
+def get_predictor():
+    from tax_predictor import TaxRegimePredictor
+    return TaxRegimePredictor()
+
+# Cached wrappers so that reruns triggered by widget interaction reuse
+# earlier results instead of recomputing them
+_cache_options = dict(ttl=None, max_entries=256, show_spinner=False)
+
+@st.cache_data(**_cache_options)
+def compute_tax_summary(income, investments, health_insurance, home_loan, edu_loan, hra):
+    """
+    Run the full tax calculation for one set of inputs (shared by both tabs)
+    
+    Returns:
+        UserData, old regime tax, new regime tax, better regime and tax saving tips
+    """
+    # Calculate total deductions
+    total_deductions = investments + health_insurance + home_loan + edu_loan + hra
+    
+    # Calculate taxable income under both regimes
+    old_regime_taxable = max(0, income - total_deductions)
+    new_regime_taxable = income  # No deductions in new regime
+    
+    user_data = UserData(
+        income=income,
+        investments=investments,
+        health_insurance=health_insurance,
+        home_loan=home_loan,
+        edu_loan=edu_loan,
+        hra=hra,
+        total_deductions=total_deductions,
+        old_regime_taxable=old_regime_taxable,
+        new_regime_taxable=new_regime_taxable
+    )
+    
+    # Calculate taxes
+    old_regime_tax = calculate_old_regime_tax(old_regime_taxable)
+    new_regime_tax = calculate_new_regime_tax(new_regime_taxable)
+    
+    # Determine better regime
+    better_regime = get_better_regime(old_regime_tax, new_regime_tax)
+    
+    # Get tax saving tips
+    tips = get_tax_saving_tips(income, investments, health_insurance, home_loan, edu_loan)
+    
+    return user_data, old_regime_tax, new_regime_tax, better_regime, tips
+
+def build_tax_report(user_data, old_regime, new_regime, better_regime, tips, ai_prediction=None):
+    """
+    Generate the PDF tax report (pdf_generator / fpdf are imported on first use)
+    
+    Not wrapped in st.cache_data: the report carries its generation time, and
+    pdf_generator already reuses reports rendered within the same minute.
+    """
+    from pdf_generator import generate_tax_report
+    return generate_tax_report(user_data, old_regime, new_regime, better_regime, tips, ai_prediction)
+
+@st.fragment
+def render_whatif(investment_grid, old_regime_totals, new_regime_total, current_investment):
+    """
+    Show the 80C what-if chart and slider for a submitted calculation
+    
+    Runs as a fragment, so moving the slider reruns only this section instead
+    of the whole app.
+    
+    Args:
+        investment_grid: 80C investment amounts, in steps of ₹1,000
+        old_regime_totals: Old regime total tax for each grid amount
+        new_regime_total: New regime total tax (independent of 80C)
+        current_investment: Grid amount closest to the entered 80C investment
+    """
+    st.markdown("---")
+    st.markdown("### 🔮 What-if: 80C Investments")
+    
+    st.line_chart({
+        "80C Investments (₹)": investment_grid,
+        "Old Regime": old_regime_totals,
+        "New Regime": np.full_like(old_regime_totals, new_regime_total)
+    }, x="80C Investments (₹)")
+    
+    whatif_investment = st.slider("📦 80C Investments (₹)", min_value=0, max_value=150000, step=1000,
+                                  value=current_investment, key="whatif_80c")
+    whatif_old_total = old_regime_totals[whatif_investment // 1000]
+    
+    st.markdown(f"Old Regime Total Tax: ₹{whatif_old_total:,} • New Regime Total Tax: ₹{new_regime_total:,}")
+
+# Shared styles for the HTML result boxes, sent as a single element per run
+# (Streamlit drops elements that a rerun does not emit, so it is not guarded)
+st.markdown("""
+<style>
+.taxbot-box { padding: 10px; border-radius: 5px; }
+.taxbot-box-large { padding: 15px; border-radius: 10px; margin-top: 20px; }
+.taxbot-green { background-color: rgba(0, 128, 0, 0.2); }
+.taxbot-green h3, .taxbot-green h4 { color: green; }
+.taxbot-blue { background-color: rgba(0, 0, 255, 0.2); }
+.taxbot-blue h3, .taxbot-blue h4 { color: blue; }
+.taxbot-footer { text-align: center; font-size: small; }
+</style>
+""", unsafe_allow_html=True)
 
 # App title and description
 st.title("🧾 TaxBot India")
@@ -49,25 +154,30 @@ with tab1:
     compare them, and get personalized tax-saving recommendations.
     """)
     
-    # Create two columns for the form
-    col1, col2 = st.columns(2)
+    # Inputs are collected in a form so that editing them does not rerun the
+    # app; the calculation runs only when the form is submitted
+    with st.form("calc_form"):
+        # Create two columns for the form
+        col1, col2 = st.columns(2)
 
-    with col1:
-        st.markdown("### Income Details")
-        income = st.number_input("💰 Annual Income (in ₹)", min_value=0, value=0, step=10000, format="%d", key="income_tab1")
-        investments = st.number_input("📦 80C Investments (in ₹)", min_value=0, value=0, step=5000, format="%d", 
-                                help="PPF, ELSS, NSC, Tax Saving FD, LIC, etc. (Max: ₹1,50,000)", key="investments_tab1")
-        health_insurance = st.number_input("🏥 Health Insurance Premium (₹)", min_value=0, value=0, step=1000, format="%d",
-                                    help="Section 80D (Max: ₹25,000 for self & family)", key="health_insurance_tab1")
+        with col1:
+            st.markdown("### Income Details")
+            income = st.number_input("💰 Annual Income (in ₹)", min_value=0, value=0, step=10000, format="%d", key="income_tab1")
+            investments = st.number_input("📦 80C Investments (in ₹)", min_value=0, value=0, step=5000, format="%d", 
+                                    help="PPF, ELSS, NSC, Tax Saving FD, LIC, etc. (Max: ₹1,50,000)", key="investments_tab1")
+            health_insurance = st.number_input("🏥 Health Insurance Premium (₹)", min_value=0, value=0, step=1000, format="%d",
+                                        help="Section 80D (Max: ₹25,000 for self & family)", key="health_insurance_tab1")
 
-    with col2:
-        st.markdown("### Deductions")
-        home_loan = st.number_input("🏠 Home Loan Interest (₹)", min_value=0, value=0, step=10000, format="%d",
-                                help="Section 24b (Max: ₹2,00,000)", key="home_loan_tab1")
-        edu_loan = st.number_input("🎓 Education Loan Interest (₹)", min_value=0, value=0, step=5000, format="%d",
-                            help="Section 80E (No upper limit)", key="edu_loan_tab1")
-        hra = st.number_input("🏙️ HRA Exemption (₹)", min_value=0, value=0, step=10000, format="%d",
-                        help="House Rent Allowance Exemption", key="hra_tab1")
+        with col2:
+            st.markdown("### Deductions")
+            home_loan = st.number_input("🏠 Home Loan Interest (₹)", min_value=0, value=0, step=10000, format="%d",
+                                    help="Section 24b (Max: ₹2,00,000)", key="home_loan_tab1")
+            edu_loan = st.number_input("🎓 Education Loan Interest (₹)", min_value=0, value=0, step=5000, format="%d",
+                                help="Section 80E (No upper limit)", key="edu_loan_tab1")
+            hra = st.number_input("🏙️ HRA Exemption (₹)", min_value=0, value=0, step=10000, format="%d",
+                            help="House Rent Allowance Exemption", key="hra_tab1")
+        
+        calc_submitted = st.form_submit_button("📊 Calculate Tax", type="primary")
 
 # Tab 2: AI Tax Advisor
 with tab2:
@@ -83,20 +193,23 @@ with tab2:
     # Input fields for the ML model
     st.markdown("### Enter Your Information")
     
-    col1_ml, col2_ml = st.columns(2)
+    with st.form("predict_form"):
+        col1_ml, col2_ml = st.columns(2)
     
-    with col1_ml:
-        income_ml = st.number_input("💰 Annual Income (in ₹)", min_value=300000, value=500000, step=50000, format="%d", key="income_ml")
-        investments_ml = st.number_input("📦 80C Investments (in ₹)", min_value=0, value=50000, step=10000, format="%d", 
-                                    max_value=150000, help="Max: ₹1,50,000", key="investments_ml")
-        health_insurance_ml = st.number_input("🏥 Health Insurance Premium (₹)", min_value=0, value=10000, step=5000, format="%d",
-                                        help="Section 80D", key="health_insurance_ml")
+        with col1_ml:
+            income_ml = st.number_input("💰 Annual Income (in ₹)", min_value=300000, value=500000, step=50000, format="%d", key="income_ml")
+            investments_ml = st.number_input("📦 80C Investments (in ₹)", min_value=0, value=50000, step=10000, format="%d", 
+                                        max_value=150000, help="Max: ₹1,50,000", key="investments_ml")
+            health_insurance_ml = st.number_input("🏥 Health Insurance Premium (₹)", min_value=0, value=10000, step=5000, format="%d",
+                                            help="Section 80D", key="health_insurance_ml")
     
-    with col2_ml:
-        hra_ml = st.number_input("🏙️ HRA Exemption (₹)", min_value=0, value=0, step=10000, format="%d", key="hra_ml")
-        home_loan_ml = st.number_input("🏠 Home Loan Interest (₹)", min_value=0, value=0, step=20000, format="%d", key="home_loan_ml")
-        edu_loan_ml = st.number_input("🎓 Education Loan Interest (₹)", min_value=0, value=0, step=10000, format="%d", key="edu_loan_ml")
-        age_ml = st.number_input("🧓 Your Age", min_value=18, max_value=100, value=30, step=1, key="age_ml")
+        with col2_ml:
+            hra_ml = st.number_input("🏙️ HRA Exemption (₹)", min_value=0, value=0, step=10000, format="%d", key="hra_ml")
+            home_loan_ml = st.number_input("🏠 Home Loan Interest (₹)", min_value=0, value=0, step=20000, format="%d", key="home_loan_ml")
+            edu_loan_ml = st.number_input("🎓 Education Loan Interest (₹)", min_value=0, value=0, step=10000, format="%d", key="edu_loan_ml")
+            age_ml = st.number_input("🧓 Your Age", min_value=18, max_value=100, value=30, step=1, key="age_ml")
+        
+        predict_submitted = st.form_submit_button("🤖 Predict Best Regime", type="primary")
 
 # Add AI Advisor button
 with tab1:
@@ -105,25 +218,18 @@ with tab1:
         st.session_state.active_tab = 1  # Switch to second tab
         st.rerun()
 
-# Tab 1: Calculate button
+# Tab 1: Calculation results
 with tab1:
-    if st.button("📊 Calculate Tax", type="primary", key="calc_btn_tab1"):
-        # Calculate total deductions
-        total_deductions = investments + health_insurance + home_loan + edu_loan + hra
-        
-        # Calculate taxable income under both regimes
-        old_regime_taxable = max(0, income - total_deductions)
-        new_regime_taxable = income  # No deductions in new regime
-        
-        # Calculate taxes
-        old_regime_tax = calculate_old_regime_tax(old_regime_taxable)
-        new_regime_tax = calculate_new_regime_tax(income)
-        
-        # Determine better regime
-        better_regime = get_better_regime(old_regime_tax, new_regime_tax)
-        
-        # Get tax saving tips
-        tips = get_tax_saving_tips(income, investments, health_insurance, home_loan, edu_loan)
+    if calc_submitted:
+        # Keep the submitted inputs, so reruns started by other widgets (such
+        # as the what-if slider) still show these results
+        st.session_state.calc_inputs = (income, investments, health_insurance, home_loan, edu_loan, hra)
+    
+    if "calc_inputs" in st.session_state:
+        income, investments, health_insurance, home_loan, edu_loan, hra = st.session_state.calc_inputs
+        user_data, old_regime_tax, new_regime_tax, better_regime, tips = compute_tax_summary(
+            income, investments, health_insurance, home_loan, edu_loan, hra
+        )
         
         # Display results
         st.markdown("---")
@@ -134,69 +240,72 @@ with tab1:
         
         with left_col:
             st.markdown("**Old Tax Regime**")
-            st.markdown(f"Taxable Income: ₹{old_regime_taxable:,}")
-            st.markdown(f"Base Tax: ₹{old_regime_tax['base_tax']:,.2f}")
-            st.markdown(f"Cess (4%): ₹{old_regime_tax['cess']:,.2f}")
-            st.markdown(f"**Total Tax: ₹{old_regime_tax['total_tax']:,.2f}**")
+            st.markdown(f"Taxable Income: ₹{user_data.old_regime_taxable:,}")
+            st.markdown(f"Base Tax: ₹{old_regime_tax['base_tax']:,}")
+            st.markdown(f"Cess (4%): ₹{old_regime_tax['cess']:,}")
+            st.markdown(f"**Total Tax: ₹{old_regime_tax['total_tax']:,}**")
         
         with right_col:
             st.markdown("**New Tax Regime**")
-            st.markdown(f"Taxable Income: ₹{new_regime_taxable:,}")
-            st.markdown(f"Base Tax: ₹{new_regime_tax['base_tax']:,.2f}")
-            st.markdown(f"Cess (4%): ₹{new_regime_tax['cess']:,.2f}")
-            st.markdown(f"**Total Tax: ₹{new_regime_tax['total_tax']:,.2f}**")
-        
-        # Recommendation box
-        st.markdown("---")
-        st.markdown("### 🎯 Recommendation")
+            st.markdown(f"Taxable Income: ₹{user_data.new_regime_taxable:,}")
+            st.markdown(f"Base Tax: ₹{new_regime_tax['base_tax']:,}")
+            st.markdown(f"Cess (4%): ₹{new_regime_tax['cess']:,}")
+            st.markdown(f"**Total Tax: ₹{new_regime_tax['total_tax']:,}**")
         
+        # Recommendation box and tax saving tips, sent as one element
         if better_regime["regime"] == "Old Regime":
             color = "green"
         else:
             color = "blue"
         
-        st.markdown(f"""
-        <div style='background-color:{color}33; padding:10px; border-radius:5px;'>
-            <h4 style='color:{color};'>💡 {better_regime["regime"]} is better for you!</h4>
-            <p>You will save approximately <b>₹{better_regime["savings"]:,.2f}</b> by choosing this regime.</p>
-        </div>
-        """, unsafe_allow_html=True)
+        tips_markdown = "\n\n".join(f"🟢 {tip}" for tip in tips)
         
-        # Tax saving tips
-        st.markdown("---")
-        st.markdown("### ✅ Tax Saving Tips")
-        
-        for tip in tips:
-            st.markdown(f"🟢 {tip}")
-        
-        # Prepare data for PDF generator
-        user_data = {
-            "income": income,
-            "investments": investments,
-            "health_insurance": health_insurance,
-            "home_loan": home_loan,
-            "edu_loan": edu_loan,
-            "hra": hra,
-            "total_deductions": total_deductions,
-            "old_regime_taxable": old_regime_taxable,
-            "new_regime_taxable": new_regime_taxable
-        }
+        st.markdown(f"""
+---
+### 🎯 Recommendation
+<div class='taxbot-box taxbot-{color}'>
+    <h4>💡 {better_regime["regime"]} is better for you!</h4>
+    <p>You will save approximately <b>₹{better_regime["savings"]:,}</b> by choosing this regime.</p>
+</div>
+
+---
+### ✅ Tax Saving Tips
+
+{tips_markdown}
+""", unsafe_allow_html=True)
         
-        # Generate PDF
-        pdf_bytes = generate_tax_report(user_data, old_regime_tax, new_regime_tax, better_regime, tips)
+        # Generate PDF, reusing the one from an earlier rerun of this session
+        # when the inputs are unchanged and its "Generated on" minute is current
+        pdf_key = ("calc", user_data, datetime.now().strftime("%Y%m%d%H%M"))
+        if st.session_state.get("pdf_key") != pdf_key:
+            st.session_state.pdf_bytes = build_tax_report(user_data, old_regime_tax, new_regime_tax, better_regime, tips)
+            st.session_state.pdf_key = pdf_key
         
         # Provide download button for PDF
         st.download_button(
             label="📄 Download Tax Report PDF",
-            data=pdf_bytes,
+            data=st.session_state.pdf_bytes,
             file_name=f"TaxBot_Report_{date.today().strftime('%d-%m-%Y')}.pdf",
             mime="application/pdf"
         )
+        
+        # Precompute the old regime tax across the whole 80C range in one
+        # vectorized pass, so the what-if slider is a pure lookup
+        investment_grid = np.arange(0, 150001, 1000)
+        other_deductions = health_insurance + home_loan + edu_loan + hra
+        whatif_taxable = np.maximum(0, income - (investment_grid + other_deductions))
+        render_whatif(
+            investment_grid,
+            calculate_old_regime_tax_vec(whatif_taxable)["total_tax"],
+            new_regime_tax["total_tax"],
+            min(investments, 150000) // 1000 * 1000
+        )
 
-# Tab 2: AI Prediction Button
+# Tab 2: AI Prediction results
 with tab2:
-    if st.button("🤖 Predict Best Regime", type="primary", key="predict_btn_tab2"):
+    if predict_submitted:
         # Use the ML model to predict
+        ml_predictor = get_predictor()
         prediction = ml_predictor.predict_regime(
             income_ml, 
             investments_ml, 
@@ -216,18 +325,18 @@ with tab2:
         else:
             result_color = "blue"
         
+        # Prediction box and additional information about the prediction,
+        # sent as one element
         st.markdown(f"""
-        <div style='background-color:{result_color}33; padding:15px; border-radius:10px; margin-top:20px;'>
-            <h3 style='color:{result_color};'>🎯 AI Prediction: {prediction["regime"]}</h3>
+        <div class='taxbot-box-large taxbot-{result_color}'>
+            <h3>🎯 AI Prediction: {prediction["regime"]}</h3>
             <p>Our AI model predicts that the <b>{prediction["regime"]}</b> is better for you.</p>
             <p>Confidence Level: {prediction["confidence"]:.1f}%</p>
             <p><i>{prediction["explanation"]}</i></p>
         </div>
-        """, unsafe_allow_html=True)
         
-        # Additional information about the prediction
-        st.markdown("### 🔍 Understanding the Prediction")
-        st.markdown("""
+        ### 🔍 Understanding the Prediction
+        
         The AI model has analyzed your inputs and compared them with patterns from thousands of 
         taxpayer profiles to determine which regime is likely to be more beneficial for you.
         
@@ -239,47 +348,32 @@ with tab2:
         
         Remember that this is a prediction based on common patterns. For the most accurate tax 
         assessment, use the detailed Tax Calculator in the first tab.
-        """)
+        """, unsafe_allow_html=True)
         
         # Calculate traditional tax for PDF report
-        total_deductions_ml = investments_ml + health_insurance_ml + home_loan_ml + edu_loan_ml + hra_ml
-        old_regime_taxable_ml = max(0, income_ml - total_deductions_ml)
-        new_regime_taxable_ml = income_ml
-        
-        old_regime_tax_ml = calculate_old_regime_tax(old_regime_taxable_ml)
-        new_regime_tax_ml = calculate_new_regime_tax(income_ml)
-        
-        better_regime_ml = get_better_regime(old_regime_tax_ml, new_regime_tax_ml)
-        
-        tips_ml = get_tax_saving_tips(income_ml, investments_ml, health_insurance_ml, home_loan_ml, edu_loan_ml)
-        
-        # Prepare data for PDF generator
-        user_data_ml = {
-            "income": income_ml,
-            "investments": investments_ml,
-            "health_insurance": health_insurance_ml,
-            "home_loan": home_loan_ml,
-            "edu_loan": edu_loan_ml,
-            "hra": hra_ml,
-            "total_deductions": total_deductions_ml,
-            "old_regime_taxable": old_regime_taxable_ml,
-            "new_regime_taxable": new_regime_taxable_ml
-        }
-        
-        # Generate PDF with AI prediction included
-        pdf_bytes_ml = generate_tax_report(
-            user_data_ml, 
-            old_regime_tax_ml, 
-            new_regime_tax_ml, 
-            better_regime_ml, 
-            tips_ml, 
-            prediction
+        user_data_ml, old_regime_tax_ml, new_regime_tax_ml, better_regime_ml, tips_ml = compute_tax_summary(
+            income_ml, investments_ml, health_insurance_ml, home_loan_ml, edu_loan_ml, hra_ml
         )
         
+        # Generate PDF with AI prediction included (reused while inputs and
+        # prediction are unchanged, within the same minute)
+        pdf_key_ml = ("ai", user_data_ml, tuple(sorted(prediction.items())),
+                      datetime.now().strftime("%Y%m%d%H%M"))
+        if st.session_state.get("pdf_key_ml") != pdf_key_ml:
+            st.session_state.pdf_bytes_ml = build_tax_report(
+                user_data_ml, 
+                old_regime_tax_ml, 
+                new_regime_tax_ml, 
+                better_regime_ml, 
+                tips_ml, 
+                prediction
+            )
+            st.session_state.pdf_key_ml = pdf_key_ml
+        
         # Provide download button for PDF
         st.download_button(
             label="📄 Download AI Tax Report PDF",
-            data=pdf_bytes_ml,
+            data=st.session_state.pdf_bytes_ml,
             file_name=f"TaxBot_AI_Report_{date.today().strftime('%d-%m-%Y')}.pdf",
             mime="application/pdf",
             help="Download a comprehensive tax report that includes both traditional calculations and AI predictions"
@@ -301,8 +395,8 @@ with tab2:
 # Footer
 st.markdown("---")
 st.markdown("""
-<div style='text-align: center;'>
-    <p style='font-size: small;'>
+<div class='taxbot-footer'>
+    <p>
         <b>TaxBot India</b> • Calculate, Compare, Save<br>
         <i>This tool is for informational purposes only. Always consult a tax professional for specific advice.</i>
     </p>
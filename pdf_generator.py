@@ -3,60 +3,66 @@ PDF Generator Module for TaxBot India
 Generates detailed tax reports as downloadable PDFs
 """
 
-from fpdf import FPDF
+from fpdf import FPDF, XPos, YPos
+from functools import lru_cache
 import datetime
 
 class TaxReportPDF(FPDF):
     """Custom PDF class for generating tax reports"""
     
-    def __init__(self):
+    def __init__(self, generated_on=None):
         super().__init__()
+        if generated_on is None:
+            generated_on = datetime.datetime.now().strftime('%d %b %Y, %H:%M')
+        self.generated_on = generated_on
         self.set_auto_page_break(auto=True, margin=15)
+        # zlib-compress page streams to keep the downloaded report small
+        self.set_compression(True)
     
     def header(self):
         """Define the header of each page"""
         # Set font
-        self.set_font("Arial", "B", 15)
+        self.set_font("Helvetica", "B", 15)
         # Title
-        self.cell(0, 10, "TaxBot India - Tax Report", 0, 1, "C")
+        self.cell(0, 10, "TaxBot India - Tax Report", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         # Date
-        self.set_font("Arial", "I", 10)
-        self.cell(0, 5, f"Generated on: {datetime.datetime.now().strftime('%d %b %Y, %H:%M')}", 0, 1, "C")
+        self.set_font("Helvetica", "I", 10)
+        self.cell(0, 5, f"Generated on: {self.generated_on}", align="C", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         # Line break
         self.ln(5)
     
     def footer(self):
         """Define the footer of each page"""
         self.set_y(-15)
-        self.set_font("Arial", "I", 8)
-        self.cell(0, 10, f"Page {self.page_no()}", 0, 0, "C")
+        self.set_font("Helvetica", "I", 8)
+        self.cell(0, 10, f"Page {self.page_no()}", align="C")
     
     def chapter_title(self, title):
         """Add a chapter title"""
-        self.set_font("Arial", "B", 12)
+        self.set_font("Helvetica", "B", 12)
         self.set_fill_color(200, 220, 255)
-        self.cell(0, 6, title, 0, 1, "L", True)
+        self.cell(0, 6, title, align="L", fill=True, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         self.ln(4)
     
     def chapter_body(self, body):
         """Add chapter content"""
-        self.set_font("Arial", "", 11)
-        self.multi_cell(0, 5, body)
+        self.set_font("Helvetica", "", 11)
+        self.multi_cell(0, 5, body, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         self.ln()
     
     def add_table_header(self, headers):
         """Add table header row"""
-        self.set_font("Arial", "B", 11)
+        self.set_font("Helvetica", "B", 11)
         self.set_fill_color(232, 232, 232)
         for header in headers:
-            self.cell(40, 7, header, 1, 0, "C", True)
+            self.cell(40, 7, header, border=1, align="C", fill=True)
         self.ln()
     
     def add_table_row(self, data):
         """Add table data row"""
-        self.set_font("Arial", "", 10)
+        self.set_font("Helvetica", "", 10)
         for item in data:
-            self.cell(40, 6, str(item), 1, 0, "C")
+            self.cell(40, 6, str(item), border=1, align="C")
         self.ln()
 
 def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips, ai_prediction=None):
@@ -64,7 +70,7 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
     Generate PDF tax report
     
     Args:
-        user_data: Dictionary with user input data
+        user_data: UserData with user input data
         old_regime: Tax calculation for old regime
         new_regime: Tax calculation for new regime
         better_regime: Information about the better regime
@@ -74,7 +80,43 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
     Returns:
         PDF file bytes
     """
-    pdf = TaxReportPDF()
+    # The report only depends on its inputs and the generation timestamp
+    # (minute resolution), so identical requests reuse the rendered PDF
+    generated_on = datetime.datetime.now().strftime('%d %b %Y, %H:%M')
+    return _render_tax_report(
+        generated_on,
+        user_data,
+        tuple(old_regime.items()),
+        tuple(new_regime.items()),
+        tuple(better_regime.items()),
+        tuple(tips),
+        tuple(ai_prediction.items()) if ai_prediction else None
+    )
+
+@lru_cache(maxsize=128)
+def _render_tax_report(generated_on, user_data, old_regime, new_regime, better_regime, tips, ai_prediction):
+    """Render the PDF tax report from hashable (memoizable) inputs"""
+    old_regime = dict(old_regime)
+    new_regime = dict(new_regime)
+    better_regime = dict(better_regime)
+    ai_prediction = dict(ai_prediction) if ai_prediction else None
+    
+    # Format currency values once, they are repeated across sections
+    # - use "Rs." instead of ₹ symbol as the core PDF fonts are latin-1 only
+    income = f"Rs. {user_data.income:,}"
+    total_deductions = f"Rs. {user_data.total_deductions:,}"
+    old_taxable = f"Rs. {user_data.old_regime_taxable:,}"
+    new_taxable = f"Rs. {user_data.new_regime_taxable:,}"
+    
+    old_base_tax = f"Rs. {old_regime['base_tax']:,}"
+    old_cess = f"Rs. {old_regime['cess']:,}"
+    old_total = f"Rs. {old_regime['total_tax']:,}"
+    
+    new_base_tax = f"Rs. {new_regime['base_tax']:,}"
+    new_cess = f"Rs. {new_regime['cess']:,}"
+    new_total = f"Rs. {new_regime['total_tax']:,}"
+    
+    pdf = TaxReportPDF(generated_on)
     
     # Add first page
     pdf.add_page()
@@ -82,36 +124,30 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
     # User Details
     pdf.chapter_title("Your Income Details")
     income_details = (
-        f"Annual Income: Rs. {user_data['income']:,}\n"
-        f"Section 80C Investments: Rs. {user_data['investments']:,}\n"
-        f"Health Insurance Premium: Rs. {user_data['health_insurance']:,}\n"
-        f"Home Loan Interest: Rs. {user_data['home_loan']:,}\n"
-        f"Education Loan Interest: Rs. {user_data['edu_loan']:,}\n"
-        f"HRA Exemption: Rs. {user_data['hra']:,}\n"
-        f"Total Deductions: Rs. {user_data['total_deductions']:,}"
+        f"Annual Income: {income}\n"
+        f"Section 80C Investments: Rs. {user_data.investments:,}\n"
+        f"Health Insurance Premium: Rs. {user_data.health_insurance:,}\n"
+        f"Home Loan Interest: Rs. {user_data.home_loan:,}\n"
+        f"Education Loan Interest: Rs. {user_data.edu_loan:,}\n"
+        f"HRA Exemption: Rs. {user_data.hra:,}\n"
+        f"Total Deductions: {total_deductions}"
     )
     pdf.chapter_body(income_details)
     
     # Tax Calculation Section
     pdf.chapter_title("Tax Calculation")
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(0, 6, f"Old Regime Taxable Income: Rs. {user_data['old_regime_taxable']:,}", 0, 1)
-    pdf.cell(0, 6, f"New Regime Taxable Income: Rs. {user_data['new_regime_taxable']:,}", 0, 1)
+    pdf.set_font("Helvetica", "B", 11)
+    taxable_income = (
+        f"Old Regime Taxable Income: {old_taxable}\n"
+        f"New Regime Taxable Income: {new_taxable}"
+    )
+    pdf.multi_cell(0, 6, taxable_income, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(5)
     
     # Tax Comparison Table
     pdf.chapter_title("Tax Regime Comparison")
     pdf.add_table_header(["Details", "Old Regime", "New Regime"])
     
-    # Format currency values - use "Rs." instead of ₹ symbol for encoding compatibility
-    old_base_tax = f"Rs. {old_regime['base_tax']:,.2f}"
-    old_cess = f"Rs. {old_regime['cess']:,.2f}"
-    old_total = f"Rs. {old_regime['total_tax']:,.2f}"
-    
-    new_base_tax = f"Rs. {new_regime['base_tax']:,.2f}"
-    new_cess = f"Rs. {new_regime['cess']:,.2f}"
-    new_total = f"Rs. {new_regime['total_tax']:,.2f}"
-    
     # Add table rows
     pdf.add_table_row(["Base Tax", old_base_tax, new_base_tax])
     pdf.add_table_row(["Cess (4%)", old_cess, new_cess])
@@ -122,7 +158,7 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
     pdf.chapter_title("Recommended Tax Regime")
     better_regime_text = (
         f"Based on your inputs, the {better_regime['regime']} is better for you.\n"
-        f"You will save approximately Rs. {better_regime['savings']:,.2f} by choosing this regime."
+        f"You will save approximately Rs. {better_regime['savings']:,} by choosing this regime."
     )
     pdf.chapter_body(better_regime_text)
     
@@ -131,12 +167,12 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
     pdf.chapter_title("Detailed Tax Breakdown")
     
     # Add a description about tax slabs for reference
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(0, 6, "Tax Slab Reference:", 0, 1)
-    pdf.set_font("Arial", "", 10)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, 6, "Tax Slab Reference:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("Helvetica", "", 10)
     
     # Old Regime Slabs
-    pdf.multi_cell(0, 5, "Old Regime Tax Slabs (FY 2023-24):")
+    pdf.multi_cell(0, 5, "Old Regime Tax Slabs (FY 2023-24):", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     old_slabs = (
         "- Income up to Rs. 2,50,000: No tax\n"
         "- Rs. 2,50,001 to Rs. 5,00,000: 5% of income exceeding Rs. 2,50,000\n"
@@ -144,11 +180,11 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
         "- Above Rs. 10,00,000: Rs. 1,12,500 + 30% of income exceeding Rs. 10,00,000\n"
         "- Plus: 4% Education & Health Cess on total tax amount"
     )
-    pdf.multi_cell(0, 5, old_slabs)
+    pdf.multi_cell(0, 5, old_slabs, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(3)
     
     # New Regime Slabs
-    pdf.multi_cell(0, 5, "New Regime Tax Slabs (FY 2023-24):")
+    pdf.multi_cell(0, 5, "New Regime Tax Slabs (FY 2023-24):", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     new_slabs = (
         "- Income up to Rs. 3,00,000: No tax\n"
         "- Rs. 3,00,001 to Rs. 6,00,000: 5% of income exceeding Rs. 3,00,000\n"
@@ -158,40 +194,40 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
         "- Above Rs. 15,00,000: Rs. 1,50,000 + 30% of income exceeding Rs. 15,00,000\n"
         "- Plus: 4% Education & Health Cess on total tax amount"
     )
-    pdf.multi_cell(0, 5, new_slabs)
+    pdf.multi_cell(0, 5, new_slabs, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(5)
     
     # Add a subsection for comprehensive tax analysis
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(0, 6, "Old Regime Tax Calculation:", 0, 1)
-    pdf.set_font("Arial", "", 10)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, 6, "Old Regime Tax Calculation:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("Helvetica", "", 10)
     
     # Create detailed old regime tax breakdown
     old_regime_breakdown = (
-        f"Base Income: Rs. {user_data['income']:,}\n"
-        f"Total Deductions: Rs. {user_data['total_deductions']:,}\n"
-        f"Taxable Income: Rs. {user_data['old_regime_taxable']:,}\n"
-        f"Base Tax: Rs. {old_regime['base_tax']:,.2f}\n"
-        f"Education & Health Cess (4%): Rs. {old_regime['cess']:,.2f}\n"
-        f"Total Tax Liability: Rs. {old_regime['total_tax']:,.2f}\n"
+        f"Base Income: {income}\n"
+        f"Total Deductions: {total_deductions}\n"
+        f"Taxable Income: {old_taxable}\n"
+        f"Base Tax: {old_base_tax}\n"
+        f"Education & Health Cess (4%): {old_cess}\n"
+        f"Total Tax Liability: {old_total}\n"
     )
-    pdf.multi_cell(0, 5, old_regime_breakdown)
+    pdf.multi_cell(0, 5, old_regime_breakdown, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(3)
     
     # New regime breakdown
-    pdf.set_font("Arial", "B", 11)
-    pdf.cell(0, 6, "New Regime Tax Calculation:", 0, 1)
-    pdf.set_font("Arial", "", 10)
+    pdf.set_font("Helvetica", "B", 11)
+    pdf.cell(0, 6, "New Regime Tax Calculation:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+    pdf.set_font("Helvetica", "", 10)
     
     new_regime_breakdown = (
-        f"Base Income: Rs. {user_data['income']:,}\n"
+        f"Base Income: {income}\n"
         f"Deductions: Not applicable in new regime\n"
-        f"Taxable Income: Rs. {user_data['new_regime_taxable']:,}\n"
-        f"Base Tax: Rs. {new_regime['base_tax']:,.2f}\n"
-        f"Education & Health Cess (4%): Rs. {new_regime['cess']:,.2f}\n"
-        f"Total Tax Liability: Rs. {new_regime['total_tax']:,.2f}\n"
+        f"Taxable Income: {new_taxable}\n"
+        f"Base Tax: {new_base_tax}\n"
+        f"Education & Health Cess (4%): {new_cess}\n"
+        f"Total Tax Liability: {new_total}\n"
     )
-    pdf.multi_cell(0, 5, new_regime_breakdown)
+    pdf.multi_cell(0, 5, new_regime_breakdown, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     pdf.ln(3)
     
     # AI Prediction Section (if available)
@@ -199,9 +235,9 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
         pdf.add_page()
         pdf.chapter_title("AI Tax Advisor Analysis")
         
-        pdf.set_font("Arial", "B", 11)
-        pdf.cell(0, 6, f"AI Prediction: {ai_prediction['regime']}", 0, 1)
-        pdf.set_font("Arial", "", 10)
+        pdf.set_font("Helvetica", "B", 11)
+        pdf.cell(0, 6, f"AI Prediction: {ai_prediction['regime']}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font("Helvetica", "", 10)
         
         ai_text = (
             f"Our machine learning model has analyzed your financial profile and predicts that the {ai_prediction['regime']} "
@@ -210,12 +246,12 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
             "Note: This AI prediction is based on patterns found in thousands of taxpayer profiles and "
             "serves as additional guidance alongside the traditional tax calculation."
         )
-        pdf.multi_cell(0, 5, ai_text)
+        pdf.multi_cell(0, 5, ai_text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
         pdf.ln(5)
         
-        pdf.set_font("Arial", "B", 11)
-        pdf.cell(0, 6, "How AI Predictions Work:", 0, 1)
-        pdf.set_font("Arial", "", 10)
+        pdf.set_font("Helvetica", "B", 11)
+        pdf.cell(0, 6, "How AI Predictions Work:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font("Helvetica", "", 10)
         
         ai_explanation = (
             "The TaxBot AI system uses advanced machine learning algorithms trained on historical tax data. "
@@ -226,27 +262,26 @@ def generate_tax_report(user_data, old_regime, new_regime, better_regime, tips,
             "- Age-related patterns in tax benefits\n\n"
             "This provides a complementary perspective to the traditional tax calculations."
         )
-        pdf.multi_cell(0, 5, ai_explanation)
+        pdf.multi_cell(0, 5, ai_explanation, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     
     # Tax Saving Tips
     pdf.add_page()
     pdf.chapter_title("Tax Saving Recommendations")
     
-    for i, tip in enumerate(tips, 1):
-        pdf.set_font("Arial", "", 11)
-        pdf.cell(0, 6, f"{i}. {tip}", 0, 1)
+    pdf.set_font("Helvetica", "", 11)
+    tips_text = "\n".join(f"{i}. {tip}" for i, tip in enumerate(tips, 1))
+    pdf.multi_cell(0, 6, tips_text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     
     # Disclaimer
     pdf.ln(10)
-    pdf.set_font("Arial", "I", 9)
+    pdf.set_font("Helvetica", "I", 9)
     disclaimer = (
         "Disclaimer: This report is for informational purposes only and should not be considered as tax advice. "
         "Tax laws are subject to change. Please consult with a qualified tax professional for specific advice "
         "related to your tax situation."
     )
-    pdf.multi_cell(0, 5, disclaimer)
+    pdf.multi_cell(0, 5, disclaimer, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
     
-    # Get the PDF content as bytes
-    pdf_bytes = pdf.output(dest="S")
-    # Return the bytes directly as they're already encoded
-    return pdf_bytes
+    # fpdf2 returns the document as a bytearray; hand callers immutable bytes
+    # (e.g. for st.download_button and the report cache)
+    return bytes(pdf.output())
@@ -0,0 +1,24 @@
+"""
+Build script for the optional compiled tax calculator (tax_calc_c)
+Usage: python setup.py build_ext --inplace
+
+The extension is optional: without Cython or a working C compiler it is
+skipped and the app keeps using the pure Python calculator.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(["tax_calc_c.pyx"])
+    # Set after cythonize, which does not carry the flag over to the
+    # extensions it returns
+    for ext in ext_modules:
+        ext.optional = True
+
+setup(
+    ext_modules=ext_modules,
+)
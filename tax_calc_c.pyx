@@ -0,0 +1,89 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled Tax Calculator Module
+Cython build of the slab calculations in tax_calculator.py.
+Build in place with: python setup.py build_ext --inplace
+"""
+
+from tax_calculator import OLD_RATE_STEPS, NEW_RATE_STEPS, CESS_PERCENT
+
+cdef enum:
+    MAX_SLABS = 8
+
+cdef struct RateStepTable:
+    int n
+    long long threshold[MAX_SLABS]
+    long long step[MAX_SLABS]
+
+cdef RateStepTable _OLD
+cdef RateStepTable _NEW
+cdef long long _CESS_PERCENT = CESS_PERCENT
+
+cdef void _load(RateStepTable* table, rate_steps):
+    """Copy a (thresholds, rate steps) table from tax_calculator into C arrays"""
+    thresholds, steps = rate_steps
+    table.n = len(steps)
+    for i in range(table.n):
+        table.threshold[i] = thresholds[i]
+        table.step[i] = steps[i]
+
+_load(&_OLD, OLD_RATE_STEPS)
+_load(&_NEW, NEW_RATE_STEPS)
+
+cdef inline long long _slab_tax(long long income, RateStepTable* table) nogil:
+    """Base tax in whole rupees for a single income"""
+    cdef long long tax = 0
+    cdef long long above
+    cdef int i
+    for i in range(table.n):
+        above = income - table.threshold[i]
+        tax += table.step[i] * (above if above > 0 else 0)
+    return (tax + 50) // 100
+
+cpdef (long long, long long, long long) _old_regime(long long income):
+    """Old regime base tax, cess and total tax for a single income"""
+    cdef long long tax = _slab_tax(income, &_OLD)
+    cdef long long cess = (tax * _CESS_PERCENT + 50) // 100
+    return tax, cess, tax + cess
+
+cpdef (long long, long long, long long) _new_regime(long long income):
+    """New regime base tax, cess and total tax for a single income"""
+    cdef long long tax = _slab_tax(income, &_NEW)
+    cdef long long cess = (tax * _CESS_PERCENT + 50) // 100
+    return tax, cess, tax + cess
+
+def calculate_old_regime_tax(income_after_deductions):
+    """
+    Calculate tax under the old regime
+    
+    Args:
+        income_after_deductions: Taxable income after all deductions
+    
+    Returns:
+        Tax amount, cess amount, and total tax liability (whole rupees)
+    """
+    tax, cess, total_tax = _old_regime(int(income_after_deductions))
+    
+    return {
+        "base_tax": tax,
+        "cess": cess,
+        "total_tax": total_tax
+    }
+
+def calculate_new_regime_tax(income):
+    """
+    Calculate tax under the new regime
+    
+    Args:
+        income: Total income (no deductions allowed)
+    
+    Returns:
+        Tax amount, cess amount, and total tax liability (whole rupees)
+    """
+    tax, cess, total_tax = _new_regime(int(income))
+    
+    return {
+        "base_tax": tax,
+        "cess": cess,
+        "total_tax": total_tax
+    }
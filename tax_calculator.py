@@ -3,76 +3,164 @@ Indian Income Tax Calculator Module
 Calculates tax liability under both old and new tax regimes
 """
 
-def calculate_old_regime_tax(income_after_deductions):
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+@dataclass(slots=True, frozen=True)
+class UserData:
+    """Taxpayer inputs and derived taxable incomes used to build a tax report"""
+    income: int
+    investments: int
+    health_insurance: int
+    home_loan: int
+    edu_loan: int
+    hra: int
+    total_deductions: int
+    old_regime_taxable: int
+    new_regime_taxable: int
+
+# Income Tax Slabs (FY 2023-24) as parallel (thresholds, bases, rates) tuples:
+# slab start, tax payable at the start of the slab and the marginal rate (in
+# percent) within it. Amounts are whole rupees so that the whole calculation
+# stays in integer arithmetic.
+OLD_REGIME_SLABS = (
+    (0, 250000, 500000, 1000000),
+    (0, 0, 12500, 112500),
+    (0, 5, 20, 30),
+)
+
+NEW_REGIME_SLABS = (
+    (0, 300000, 600000, 900000, 1200000, 1500000),
+    (0, 0, 15000, 45000, 90000, 150000),
+    (0, 5, 10, 15, 20, 30),
+)
+
+# Education and Health Cess (4%)
+CESS_PERCENT = 4
+
+def _rate_steps(slabs):
+    """Increase in the marginal rate at each slab threshold"""
+    thresholds, _, rates = slabs
+    return thresholds, tuple(rate - prev for prev, rate in zip((0,) + rates[:-1], rates))
+
+# Array form of the slab tables for the vectorized calculations
+OLD_THR, OLD_BASE, OLD_RATE = (np.array(column, dtype=np.int64) for column in OLD_REGIME_SLABS)
+NEW_THR, NEW_BASE, NEW_RATE = (np.array(column, dtype=np.int64) for column in NEW_REGIME_SLABS)
+
+# (thresholds, rate steps) form of the slab tables for the scalar cores
+OLD_RATE_STEPS = _rate_steps(OLD_REGIME_SLABS)
+NEW_RATE_STEPS = _rate_steps(NEW_REGIME_SLABS)
+
+def _percent_of(amount, percent):
+    """Percentage of an integer amount, rounded to the nearest rupee"""
+    return (amount * percent + 50) // 100
+
+def _slab_tax_vec(income, thresholds, bases, rates):
     """
-    Calculate tax under the old regime
+    Evaluate a slab table for a whole vector of incomes in one pass
     
     Args:
-        income_after_deductions: Taxable income after all deductions
+        income: Array of taxable incomes (whole rupees)
+        thresholds: Slab start thresholds (ascending)
+        bases: Tax payable at the start of each slab
+        rates: Marginal rate (percent) within each slab
         
     Returns:
-        Tax amount, cess amount, and total tax liability
+        Dictionary of arrays with tax, cess and total tax liability
     """
-    tax = 0
+    income = np.asarray(income).astype(np.int64)
     
-    # Income Tax Slabs for Old Regime (FY 2023-24)
-    if income_after_deductions <= 250000:
-        tax = 0
-    elif income_after_deductions <= 500000:
-        tax = (income_after_deductions - 250000) * 0.05
-    elif income_after_deductions <= 1000000:
-        tax = 12500 + (income_after_deductions - 500000) * 0.2
-    else:
-        tax = 112500 + (income_after_deductions - 1000000) * 0.3
+    # Index of the slab each income falls into (slab upper bounds are inclusive)
+    idx = np.clip(np.searchsorted(thresholds, income, side="right") - 1, 0, None)
+    tax = bases[idx] + _percent_of(income - thresholds[idx], rates[idx])
     
     # Education and Health Cess (4%)
-    cess = tax * 0.04
-    
-    total_tax = tax + cess
+    cess = _percent_of(tax, CESS_PERCENT)
     
     return {
         "base_tax": tax,
         "cess": cess,
-        "total_tax": total_tax
+        "total_tax": tax + cess
     }
 
-def calculate_new_regime_tax(income):
+def calculate_old_regime_tax_vec(income):
     """
-    Calculate tax under the new regime
+    Calculate tax under the old regime for an array of incomes
     
     Args:
-        income: Total income (no deductions allowed)
+        income: Array of taxable incomes after all deductions
         
     Returns:
-        Tax amount, cess amount, and total tax liability
+        Dictionary of arrays with tax, cess and total tax liability
+    """
+    return _slab_tax_vec(income, OLD_THR, OLD_BASE, OLD_RATE)
+
+def calculate_new_regime_tax_vec(income):
+    """
+    Calculate tax under the new regime for an array of incomes
+    
+    Args:
+        income: Array of total incomes (no deductions allowed)
+        
+    Returns:
+        Dictionary of arrays with tax, cess and total tax liability
+    """
+    return _slab_tax_vec(income, NEW_THR, NEW_BASE, NEW_RATE)
+
+def _slab_tax_core(income, thresholds, steps):
+    """
+    Base tax and cess (whole rupees) for a single income from a rate-step table
+    
+    Plain Python on purpose: a rerun makes two scalar calls, so a JIT would
+    only add its import and compile/cache-load time to the app's cold start.
     """
+    # Each threshold adds its rate increase (percent) on the income above it,
+    # branch-free on the income value; the sum is in hundredths of a rupee
     tax = 0
+    for i in range(len(steps)):
+        tax += steps[i] * max(0, income - thresholds[i])
+    tax = (tax + 50) // 100
+    return tax, (tax * CESS_PERCENT + 50) // 100
+
+def calculate_old_regime_tax(income_after_deductions):
+    """
+    Calculate tax under the old regime
     
-    # Income Tax Slabs for New Regime (FY 2023-24)
-    if income <= 300000:
-        tax = 0
-    elif income <= 600000:
-        tax = (income - 300000) * 0.05
-    elif income <= 900000:
-        tax = 15000 + (income - 600000) * 0.1
-    elif income <= 1200000:
-        tax = 45000 + (income - 900000) * 0.15
-    elif income <= 1500000:
-        tax = 90000 + (income - 1200000) * 0.2
-    else:
-        tax = 150000 + (income - 1500000) * 0.3
+    Args:
+        income_after_deductions: Taxable income after all deductions
+        
+    Returns:
+        Tax amount, cess amount, and total tax liability (whole rupees)
+    """
+    tax, cess = _slab_tax_core(int(income_after_deductions), *OLD_RATE_STEPS)
     
-    # Education and Health Cess (4%)
-    cess = tax * 0.04
+    return {
+        "base_tax": tax,
+        "cess": cess,
+        "total_tax": tax + cess
+    }
+
+def calculate_new_regime_tax(income):
+    """
+    Calculate tax under the new regime
     
-    total_tax = tax + cess
+    Args:
+        income: Total income (no deductions allowed)
+        
+    Returns:
+        Tax amount, cess amount, and total tax liability (whole rupees)
+    """
+    tax, cess = _slab_tax_core(int(income), *NEW_RATE_STEPS)
     
     return {
         "base_tax": tax,
         "cess": cess,
-        "total_tax": total_tax
+        "total_tax": tax + cess
     }
 
+@lru_cache(maxsize=2048)
 def get_tax_saving_tips(income, investments, health_insurance, home_loan, edu_loan):
     """
     Generate personalized tax saving tips based on user inputs
@@ -85,7 +173,7 @@ def get_tax_saving_tips(income, investments, health_insurance, home_loan, edu_lo
         edu_loan: Education loan interest
         
     Returns:
-        List of tax saving tips
+        Tuple of tax saving tips (immutable, as results are shared by the cache)
     """
     tips = []
     
@@ -113,7 +201,7 @@ def get_tax_saving_tips(income, investments, health_insurance, home_loan, edu_lo
     if income > 1000000:
         tips.append("Consider splitting income with family members (income splitting) to reduce tax burden.")
     
-    return tips
+    return tuple(tips)
 
 def get_better_regime(old_regime_tax, new_regime_tax):
     """
@@ -1,88 +1,544 @@
 """
 ML-based Tax Regime Predictor Module for TaxBot India
-Uses a Decision Tree model to predict the best tax regime based on user data.
+Predicts the best tax regime from the deduction/income ratio, with the original
+Decision Tree model available for comparison.
 """
 
-import pandas as pd
-import numpy as np
-from sklearn.tree import DecisionTreeClassifier
+import os
+import pathlib
+import pickle
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    
+    import numpy as np
+    from sklearn.tree import DecisionTreeClassifier
+
+__all__ = ["TaxRegimePredictor"]
+
+# Model input features, in training column order (also the argument names of
+# the compiled prediction function and the predict_regime arguments). The
+# total deductions are left out: they are the sum of five of these columns,
+# so they only add a redundant feature to split on.
+FEATURES = ('income', 'investments_80c', 'health_insurance', 'hra',
+            'home_loan', 'edu_loan', 'age')
+
+# Number of synthetic taxpayers in the training set
+TRAINING_SAMPLES = 500
+
+# The training data is generated from a fixed seed, so the fitted model is
+# deterministic and can be reused across process restarts. Bump the version
+# whenever the training data or model parameters change.
+_MODEL_CACHE = pathlib.Path(__file__).with_suffix(".pkl")
+_MODEL_CACHE_VERSION = 5
+
+# Set to "1" to serve predictions from the trained Decision Tree by default
+# (requires scikit-learn, see the "ml" extra)
+_TRAIN_ENV_VAR = "TAXBOT_TRAIN"
+
+# Old regime is better when deductions exceed this share of income. This is
+# the rule the training labels are generated from, so the tree only ever
+# approximates it.
+DEDUCTION_RATIO_THRESHOLD = 0.12
+
+# Explanations shown with a prediction, chosen by regime and deduction level
+OLD_REGIME_HIGH_DEDUCTIONS = "Your high deduction amount makes the Old Regime more beneficial."
+OLD_REGIME_DEFAULT = "Based on your profile, the Old Regime provides better tax benefits."
+NEW_REGIME_LOW_DEDUCTIONS = "With low deductions, the New Regime's reduced tax rates are more beneficial."
+NEW_REGIME_DEFAULT = "Based on your overall profile, the New Regime appears to be more advantageous."
+
+# Result strings indexed by predicted class (0 New, 1 Old), and explanations
+# indexed by prediction * 2 + (1 if the deduction level reinforces it), so
+# every result reuses the same string objects
+_REGIME_LABELS = ("New Regime", "Old Regime")
+_EXPLANATIONS = (NEW_REGIME_DEFAULT, NEW_REGIME_LOW_DEDUCTIONS,
+                 OLD_REGIME_DEFAULT, OLD_REGIME_HIGH_DEDUCTIONS)
+
+def _walk(x, feature, threshold, left, right):
+    """Walk a flattened decision tree for one feature row and return its leaf node"""
+    node = 0
+    while left[node] != -1:
+        if x[feature[node]] <= threshold[node]:
+            node = left[node]
+        else:
+            node = right[node]
+    return node
+
+def _compile_walk():
+    """Return _walk compiled with Numba, or None when Numba is not installed"""
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_walk)
+
+def _load_c_library(source):
+    """
+    Compile C source into a shared library and load it with ctypes.
+    
+    The library is cached next to the module under a name derived from the
+    source hash, so a given tree is only compiled once. Publishing a new
+    build removes the libraries cached for earlier trees.
+    
+    Args:
+        source: C99 source code
+    
+    Returns:
+        The loaded ctypes.CDLL, or None if no C compiler is available or the
+        library cannot be built or loaded
+    """
+    import ctypes
+    import hashlib
+    import shutil
+    import subprocess
+    import tempfile
+    
+    digest = hashlib.sha256(source.encode()).hexdigest()[:16]
+    lib_path = _MODEL_CACHE.with_name(f"{_MODEL_CACHE.stem}_tree_{digest}.so")
+    if lib_path.exists():
+        try:
+            return ctypes.CDLL(str(lib_path))
+        except OSError:
+            # Truncated or foreign (e.g. other architecture) build: rebuild it
+            pass
+    
+    compiler = os.environ.get("CC", "cc")
+    if shutil.which(compiler) is None:
+        return None
+    with tempfile.TemporaryDirectory() as build_dir:
+        src_path = pathlib.Path(build_dir) / "tree.c"
+        out_path = pathlib.Path(build_dir) / "tree.so"
+        src_path.write_text(source)
+        result = subprocess.run(
+            [compiler, "-std=c99", "-O3", "-shared", "-fPIC", "-o", str(out_path), str(src_path)],
+            capture_output=True
+        )
+        if result.returncode != 0:
+            return None
+        
+        # Publish through a uniquely named file in the target directory, so
+        # processes building concurrently never write into the same file and
+        # the final rename is atomic
+        tmp_file = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=lib_path.parent, prefix=f"{lib_path.stem}.",
+                                             suffix=".so.tmp", delete=False) as tmp_file:
+                tmp_file.write(out_path.read_bytes())
+            pathlib.Path(tmp_file.name).replace(lib_path)
+        except OSError:
+            if tmp_file is not None:
+                pathlib.Path(tmp_file.name).unlink(missing_ok=True)
+            # Read-only install: load the build directly (the mapping stays
+            # valid after the temporary directory is removed)
+            lib_path = out_path
+        else:
+            # Drop builds of earlier trees (e.g. older model versions);
+            # processes that already loaded one keep their mapping
+            for stale in lib_path.parent.glob(f"{_MODEL_CACHE.stem}_tree_*.so"):
+                if stale != lib_path:
+                    try:
+                        stale.unlink()
+                    except OSError:
+                        pass
+        try:
+            return ctypes.CDLL(str(lib_path))
+        except OSError:
+            return None
+
+@dataclass(slots=True, frozen=True)
+class _SharedModel:
+    """Fitted legacy Decision Tree with its packed tables and compiled backends"""
+    model: "DecisionTreeClassifier"
+    # (X, y) the tree was fitted on; None when it was loaded from the cache
+    training_data: "tuple[np.ndarray, np.ndarray] | None"
+    # (feature, threshold, left, right) arrays in packed node order
+    tree_arrays: "tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]"
+    # Maps sklearn node ids to packed node ids
+    node_index: "np.ndarray"
+    leaf_class: "np.ndarray"
+    leaf_probability: "np.ndarray"
+    # Prediction backends; only the first available one is built (C, then
+    # the Numba tree walk, then the generated Python function)
+    c_predict: "Callable | None"
+    walk: "Callable | None"
+    fast_predict: "Callable | None"
 
 class TaxRegimePredictor:
     """
-    ML model for predicting the best tax regime (Old vs New) for a taxpayer
-    based on their income and deduction details.
+    Predicts the best tax regime (Old vs New) for a taxpayer based on their
+    income and deduction details.
     """
     
-    def __init__(self):
-        """Initialize the model and training data"""
-        # Create sample training data
-        self.training_data = self._generate_training_data()
-        self.model = self._train_model()
+    # Legacy model state (fitted tree, leaf tables and compiled backends),
+    # loaded or trained once per process and shared by every instance
+    _shared_model = None
+    _shared_model_lock = threading.Lock()
+    
+    def __init__(self, legacy_ml=None):
+        """
+        Initialize the predictor.
+        
+        Args:
+            legacy_ml: Predict with the trained Decision Tree instead of the
+                deduction/income ratio rule (loads scikit-learn). Defaults to
+                whether the TAXBOT_TRAIN environment variable is "1"
+        """
+        if legacy_ml is None:
+            legacy_ml = os.environ.get(_TRAIN_ENV_VAR) == "1"
+        self.legacy_ml = legacy_ml
+        self._shared = self._ensure_model() if legacy_ml else None
+        self._local = threading.local()
+    
+    @property
+    def model(self):
+        """Fitted Decision Tree, or None when predicting with the ratio rule"""
+        return self._shared.model if self._shared is not None else None
+    
+    @property
+    def training_data(self):
+        """(X, y) the Decision Tree was fitted on, or None if it was not trained here"""
+        return self._shared.training_data if self._shared is not None else None
+    
+    @classmethod
+    def _ensure_model(cls):
+        """
+        Return the shared legacy model state, building it on first use.
         
-    def _generate_training_data(self):
+        Returns:
+            _SharedModel built by _build_shared_model
+        """
+        if cls._shared_model is None:
+            with cls._shared_model_lock:
+                if cls._shared_model is None:
+                    cls._shared_model = cls._build_shared_model()
+        return cls._shared_model
+    
+    @classmethod
+    def _build_shared_model(cls):
+        """
+        Load the Decision Tree, training it only if no cached model exists.
+        
+        Returns:
+            _SharedModel holding the fitted tree and its prediction backends
+        """
+        training_data = None
+        model = cls._load_cached_model()
+        if model is None:
+            # Create sample training data as an (X, y) pair
+            training_data = cls._generate_training_data()
+            model = cls._train_model(training_data)
+            cls._save_cached_model(model)
+        tree_arrays, node_index = cls._pack_tree(model.tree_)
+        leaf_class, leaf_probability = cls._leaf_tables(model, node_index)
+        # Prefer the compiled C tree, then the Numba tree walk; the generated
+        # Python function is the fallback when neither is available
+        c_predict = cls._compile_c_model(tree_arrays, leaf_class, leaf_probability)
+        walk = fast_predict = None
+        if c_predict is None:
+            walk = _compile_walk()
+            if walk is None:
+                fast_predict = cls._compile_model(tree_arrays, leaf_class, leaf_probability)
+        
+        return _SharedModel(model, training_data, tree_arrays, node_index, leaf_class,
+                            leaf_probability, c_predict, walk, fast_predict)
+    
+    @staticmethod
+    def _cache_key():
+        """Identify the model version and the sklearn build that pickled it"""
+        import sklearn
+        
+        return (_MODEL_CACHE_VERSION, sklearn.__version__)
+    
+    @classmethod
+    def _load_cached_model(cls):
+        """Load the fitted model from the on-disk cache, or None on a miss"""
+        try:
+            cached = pickle.loads(_MODEL_CACHE.read_bytes())
+        except Exception:
+            # Missing, unreadable or incompatible cache: retrain instead
+            return None
+        if cached.get("key") != cls._cache_key():
+            return None
+        return cached["model"]
+    
+    @classmethod
+    def _save_cached_model(cls, model):
+        """Persist the fitted model; failures (e.g. read-only install) are ignored"""
+        import tempfile
+        
+        payload = pickle.dumps({"key": cls._cache_key(), "model": model})
+        # Unique temporary name, so concurrent processes never interleave writes
+        tmp_file = None
+        try:
+            with tempfile.NamedTemporaryFile(dir=_MODEL_CACHE.parent, prefix=f"{_MODEL_CACHE.name}.",
+                                             suffix=".tmp", delete=False) as tmp_file:
+                tmp_file.write(payload)
+            pathlib.Path(tmp_file.name).replace(_MODEL_CACHE)
+        except OSError:
+            if tmp_file is not None:
+                pathlib.Path(tmp_file.name).unlink(missing_ok=True)
+        
+    @staticmethod
+    def _generate_training_data():
         """
         Generate realistic training data based on Indian income tax patterns.
         This could be replaced with data from a CSV file or database.
+        
+        Returns:
+            Tuple of a contiguous float32 feature matrix (columns in FEATURES
+            order) and an int8 label vector (1 for Old, 0 for New regime)
         """
-        # Create a dataset with 100 samples
-        np.random.seed(42)  # For reproducibility
+        import numpy as np
+        
+        # Create a dataset of TRAINING_SAMPLES taxpayers
+        n = TRAINING_SAMPLES
+        rng = np.random.default_rng(42)  # For reproducibility
         
-        # Generate random income values between 3L and 25L
-        income = np.random.randint(300000, 2500000, 100)
+        # Draw income (3L to 25L), the fixed-range deductions and age (affects
+        # tax brackets) in a single call, one column each
+        income, ded_80d, hra, home_loan, edu_loan, age = rng.integers(
+            [300000, 0, 0, 0, 0, 22],
+            [2500000, 50000, 200000, 300000, 100000, 70],
+            size=(n, 6)
+        ).T
         
-        # Generate deduction values (with some correlation to income)
-        ded_80c = np.clip(income * np.random.uniform(0.05, 0.15, 100), 0, 150000)
-        ded_80d = np.random.randint(0, 50000, 100)
-        hra = np.random.randint(0, 200000, 100)
-        home_loan = np.random.randint(0, 300000, 100)
-        edu_loan = np.random.randint(0, 100000, 100)
+        # Not every taxpayer rents or has a home or education loan; without
+        # these gaps nearly every sample clears the ratio and the New Regime
+        # is left with only a handful of labels
+        has_hra, has_home_loan, has_edu_loan = (rng.random((n, 3)) < 0.5).T
+        hra = hra * has_hra
+        home_loan = home_loan * has_home_loan
+        edu_loan = edu_loan * has_edu_loan
+        
+        # 80C investments grow with income, up to the 1.5L limit
+        ded_80c = np.clip(income * rng.uniform(0.05, 0.15, n), 0, 150000)
         
         # Calculate total deductions
         total_deductions = ded_80c + ded_80d + hra + home_loan + edu_loan
         
-        # Age (affects tax brackets)
-        age = np.random.randint(22, 70, 100)
-        
         # Generate labels based on logical rules that simulate real tax benefits
         # Old regime is better when deductions are high relative to income
         deduction_income_ratio = total_deductions / income
         
         # Create a label based on this ratio - higher ratio means old regime is better
         # This is a simplification; real tax calculation would be more complex
-        labels = np.where(deduction_income_ratio > 0.12, 1, 0)  # 1 for Old regime, 0 for New regime
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            'Income': income,
-            '80C_Investments': ded_80c,
-            'Health_Insurance': ded_80d,
-            'HRA': hra,
-            'Home_Loan': home_loan,
-            'Edu_Loan': edu_loan,
-            'Age': age,
-            'Total_Deductions': total_deductions,
-            'Best_Regime': labels  # 1 for Old, 0 for New
-        })
-        
-        return df
-    
-    def _train_model(self):
-        """Train a Decision Tree model on the training data."""
-        X = self.training_data[['Income', '80C_Investments', 'Health_Insurance', 
-                                'HRA', 'Home_Loan', 'Edu_Loan', 'Age', 'Total_Deductions']]
-        y = self.training_data['Best_Regime']
-        
-        # Create and train model
-        model = DecisionTreeClassifier(max_depth=5)
+        labels = np.where(deduction_income_ratio > DEDUCTION_RATIO_THRESHOLD, 1, 0)  # 1 for Old regime, 0 for New regime
+        
+        # Stack the features straight into the matrix sklearn trains on
+        # (sklearn fits trees in float32 internally, so this avoids a copy)
+        X = np.ascontiguousarray(
+            np.column_stack([income, ded_80c, ded_80d, hra, home_loan,
+                             edu_loan, age]),
+            dtype=np.float32
+        )
+        y = labels.astype(np.int8)
+        
+        return X, y
+    
+    @staticmethod
+    def _train_model(training_data):
+        """
+        Train a Decision Tree model on the training data.
+        
+        Args:
+            training_data: (X, y) pair from _generate_training_data
+            
+        Returns:
+            Fitted DecisionTreeClassifier
+            
+        Raises:
+            RuntimeError: If every leaf of the fitted tree predicts the same
+                regime, i.e. the model would ignore its inputs
+        """
+        from sklearn.tree import DecisionTreeClassifier
+        
+        X, y = training_data
+        
+        # Create and train model. The labels come from a single ratio test, so
+        # a handful of leaves captures the boundary; the caps keep the tree to
+        # at most 7 nodes instead of fitting noise out to depth 5
+        model = DecisionTreeClassifier(max_depth=3, max_leaf_nodes=4,
+                                       min_samples_leaf=10, random_state=0)
         model.fit(X, y)
         
+        # min_samples_leaf can stop the tree from isolating a small minority
+        # class, which would leave a constant classifier
+        tree = model.tree_
+        leaf_values = tree.value[tree.children_left == -1, 0]
+        if len(set(leaf_values.argmax(axis=1).tolist())) < 2:
+            raise RuntimeError("Decision Tree predicts a single regime for every input; "
+                               "check the training data")
+        
         return model
     
+    @staticmethod
+    def _pack_tree(tree):
+        """
+        Repack a fitted sklearn tree into flat arrays in breadth-first node order.
+        
+        sklearn numbers nodes depth-first; renumbering them level by level
+        keeps siblings and the top levels of the tree adjacent in memory.
+        
+        Thresholds are floored to int32 rupees: every feature is a whole
+        number, and for an integer x, x <= t exactly when x <= floor(t).
+        
+        Returns:
+            Tuple of the (feature, threshold, left, right) arrays in packed
+            order, and an array mapping sklearn node ids to packed ids
+        """
+        import numpy as np
+        
+        order = [0]
+        for node in order:  # Appending while iterating visits nodes breadth-first
+            if tree.children_left[node] != -1:
+                order.extend((tree.children_left[node], tree.children_right[node]))
+        order = np.array(order)
+        
+        node_index = np.empty(tree.node_count, dtype=np.int32)
+        node_index[order] = np.arange(len(order), dtype=np.int32)
+        is_leaf = tree.children_left[order] == -1
+        left = np.where(is_leaf, -1, node_index[tree.children_left[order]])
+        right = np.where(is_leaf, -1, node_index[tree.children_right[order]])
+        
+        arrays = (
+            np.ascontiguousarray(tree.feature[order], dtype=np.int32),
+            np.ascontiguousarray(np.floor(tree.threshold[order]), dtype=np.int32),
+            np.ascontiguousarray(left, dtype=np.int32),
+            np.ascontiguousarray(right, dtype=np.int32)
+        )
+        return arrays, node_index
+    
+    @staticmethod
+    def _leaf_tables(model, node_index):
+        """
+        Precompute the predicted class and its probability for every node.
+        
+        Args:
+            model: Fitted DecisionTreeClassifier
+            node_index: Array mapping sklearn node ids to packed ids
+            
+        Returns:
+            Tuple of (class, probability) arrays indexed by packed node id, so
+            a prediction is one tree walk plus two lookups
+        """
+        import numpy as np
+        
+        tree_values = model.tree_.value[:, 0, :]
+        values = np.empty_like(tree_values)
+        values[node_index] = tree_values
+        best = values.argmax(axis=1)
+        probability = values[np.arange(len(values)), best] / values.sum(axis=1)
+        return model.classes_[best].astype(np.int64), probability.astype(np.float64)
+    
+    @staticmethod
+    def _compile_model(tree_arrays, leaf_class, leaf_probability):
+        """
+        Compile the fitted tree into a nested if/else Python function.
+        
+        The generated function takes the features as plain scalars and returns
+        (predicted class, class probability) from a single walk of the tree,
+        avoiding sklearn's per-call input validation and array dispatch.
+        
+        Args:
+            tree_arrays: Packed (feature, threshold, left, right) arrays
+            leaf_class: Predicted class per packed node
+            leaf_probability: Class probability per packed node
+        """
+        feature, threshold, left, right = tree_arrays
+        lines = [f"def _fast_predict({', '.join(FEATURES)}):"]
+        
+        def emit(node, depth):
+            indent = "    " * depth
+            if left[node] == -1:  # Leaf node
+                prediction = int(leaf_class[node])
+                probability = float(leaf_probability[node])
+                lines.append(f"{indent}return {prediction}, {probability!r}")
+            else:
+                name = FEATURES[feature[node]]
+                lines.append(f"{indent}if {name} <= {int(threshold[node])}:")
+                emit(left[node], depth + 1)
+                lines.append(f"{indent}else:")
+                emit(right[node], depth + 1)
+        
+        emit(0, 1)
+        namespace = {}
+        exec("\n".join(lines), namespace)
+        return namespace["_fast_predict"]
+    
+    @staticmethod
+    def _compile_c_model(tree_arrays, leaf_class, leaf_probability):
+        """
+        Compile the fitted tree into a C function loaded through ctypes.
+        
+        The generated function takes the features as whole numbers, stores the class
+        probability through its last argument and returns the predicted class.
+        
+        Args:
+            tree_arrays: Packed (feature, threshold, left, right) arrays
+            leaf_class: Predicted class per packed node
+            leaf_probability: Class probability per packed node
+            
+        Returns:
+            The ctypes function, or None if the library could not be built
+        """
+        feature, threshold, left, right = tree_arrays
+        params = ", ".join(f"long long {name}" for name in FEATURES)
+        lines = [f"int predict_regime_tree({params}, double* probability) {{"]
+        
+        def emit(node, depth):
+            indent = "    " * depth
+            if left[node] == -1:  # Leaf node
+                lines.append(f"{indent}*probability = {float(leaf_probability[node])!r};")
+                lines.append(f"{indent}return {int(leaf_class[node])};")
+            else:
+                name = FEATURES[feature[node]]
+                lines.append(f"{indent}if ({name} <= {int(threshold[node])}) {{")
+                emit(left[node], depth + 1)
+                lines.append(f"{indent}}} else {{")
+                emit(right[node], depth + 1)
+                lines.append(f"{indent}}}")
+        
+        emit(0, 1)
+        lines.append("}")
+        lib = _load_c_library("\n".join(lines) + "\n")
+        if lib is None:
+            return None
+        
+        import ctypes
+        
+        predict = lib.predict_regime_tree
+        predict.argtypes = [ctypes.c_longlong] * len(FEATURES) + [ctypes.POINTER(ctypes.c_double)]
+        predict.restype = ctypes.c_int
+        return predict
+    
+    def _call_buffers(self):
+        """
+        Return this thread's reusable input row and probability out-parameter.
+        
+        The predictor is shared between app sessions running on different
+        threads, so each thread allocates its own buffers on first use.
+        """
+        buffers = self._local
+        if not hasattr(buffers, "row"):
+            import ctypes
+            import numpy as np
+            
+            buffers.row = np.empty(len(FEATURES), dtype=np.int64)
+            buffers.probability = ctypes.c_double()
+            buffers.probability_ref = ctypes.byref(buffers.probability)
+        return buffers
+    
     def predict_regime(self, income, investments_80c, health_insurance, 
                        hra, home_loan, edu_loan, age=30):
         """
         Predict the best tax regime based on user inputs.
         
+        The Decision Tree sees every amount rounded to the nearest whole rupee
+        (halves to even), since its thresholds are compared as integers.
+        
         Args:
             income: Annual income
             investments_80c: 80C investments
@@ -98,40 +554,102 @@ class TaxRegimePredictor:
         # Calculate total deductions
         total_deductions = investments_80c + health_insurance + hra + home_loan + edu_loan
         
-        # Format input for prediction
-        input_data = np.array([[
-            income, 
-            investments_80c, 
-            health_insurance, 
-            hra,
-            home_loan,
-            edu_loan,
-            age,
-            total_deductions
-        ]])
-        
-        # Make prediction
-        prediction = self.model.predict(input_data)[0]
-        probability = self.model.predict_proba(input_data)[0]
-        
-        # Determine regime and confidence
-        regime = "Old Regime" if prediction == 1 else "New Regime"
-        confidence = probability[prediction] * 100
-        
-        # Create explanation based on features
-        if prediction == 1:  # Old Regime
-            if total_deductions > 150000:
-                explanation = "Your high deduction amount makes the Old Regime more beneficial."
-            else:
-                explanation = "Based on your profile, the Old Regime provides better tax benefits."
-        else:  # New Regime
-            if total_deductions < 50000:
-                explanation = "With low deductions, the New Regime's reduced tax rates are more beneficial."
+        if self.legacy_ml:
+            # The compiled trees compare whole rupees against integer
+            # thresholds, so round fractional amounts to the nearest rupee
+            features = (
+                round(income),
+                round(investments_80c),
+                round(health_insurance),
+                round(hra),
+                round(home_loan),
+                round(edu_loan),
+                round(age)
+            )
+            
+            # Make prediction with the compiled tree
+            shared = self._shared
+            if shared.c_predict is not None:
+                buffers = self._call_buffers()
+                prediction = shared.c_predict(*features, buffers.probability_ref)
+                probability = buffers.probability.value
+            elif shared.walk is not None:
+                x = self._call_buffers().row
+                x[:] = features
+                node = shared.walk(x, *shared.tree_arrays)
+                prediction = int(shared.leaf_class[node])
+                probability = float(shared.leaf_probability[node])
             else:
-                explanation = "Based on your overall profile, the New Regime appears to be more advantageous."
+                prediction, probability = shared.fast_predict(*features)
+            confidence = probability * 100
+        else:
+            # Apply the labelling rule directly; confidence grows with the
+            # distance from the decision threshold
+            ratio = total_deductions / max(income, 1)
+            prediction = int(ratio > DEDUCTION_RATIO_THRESHOLD)
+            confidence = min(100.0, 50.0 + abs(ratio - DEDUCTION_RATIO_THRESHOLD) * 400.0)
+        
+        # Create explanation based on features: high deductions back the Old
+        # Regime, low deductions back the New Regime
+        if prediction == 1:
+            reinforced = total_deductions > 150000
+        else:
+            reinforced = total_deductions < 50000
         
         return {
-            "regime": regime,
+            "regime": _REGIME_LABELS[prediction],
             "confidence": confidence,
-            "explanation": explanation
-        }
\ No newline at end of file
+            "explanation": _EXPLANATIONS[prediction * 2 + reinforced]
+        }
+    
+    def predict_regime_batch(self, rows):
+        """
+        Predict the best tax regime for many taxpayers in one vectorized pass.
+        
+        Args:
+            rows: Array-like of shape (N, 7), one row per taxpayer with columns
+                in predict_regime argument order (income, investments_80c,
+                health_insurance, hra, home_loan, edu_loan, age)
+            
+        Returns:
+            List of N dictionaries with prediction results, matching
+            predict_regime row by row (the Decision Tree sees the same
+            whole-rupee rounded inputs)
+            
+        Raises:
+            ValueError: If rows is not a single row or an (N, 7) matrix
+        """
+        import numpy as np
+        
+        rows = np.asarray(rows, dtype=np.float64)
+        if rows.ndim == 1:
+            rows = rows.reshape(1, -1)
+        if rows.ndim != 2 or rows.shape[1] != len(FEATURES):
+            raise ValueError(f"Expected rows of {len(FEATURES)} features, got shape {rows.shape}")
+        income = rows[:, 0]
+        
+        # Calculate total deductions (same summation order as predict_regime)
+        total_deductions = rows[:, 1] + rows[:, 2] + rows[:, 3] + rows[:, 4] + rows[:, 5]
+        
+        if self.legacy_ml:
+            # One call to the low-level tree finds the leaf of every row. It
+            # skips the estimator's input validation, so build the contiguous
+            # float32 matrix it expects here, rounded to whole rupees like
+            # predict_regime (np.rint also rounds halves to even)
+            features = np.ascontiguousarray(np.rint(rows), dtype=np.float32)
+            shared = self._shared
+            leaves = shared.node_index[shared.model.tree_.apply(features)]
+            prediction = shared.leaf_class[leaves]
+            confidence = shared.leaf_probability[leaves] * 100
+        else:
+            ratio = total_deductions / np.maximum(income, 1)
+            prediction = (ratio > DEDUCTION_RATIO_THRESHOLD).astype(np.int64)
+            confidence = np.minimum(100.0, 50.0 + np.abs(ratio - DEDUCTION_RATIO_THRESHOLD) * 400.0)
+        
+        reinforced = np.where(prediction == 1, total_deductions > 150000, total_deductions < 50000)
+        explanation_index = prediction * 2 + reinforced
+        
+        return [
+            {"regime": _REGIME_LABELS[p], "confidence": c, "explanation": _EXPLANATIONS[e]}
+            for p, c, e in zip(prediction.tolist(), confidence.tolist(), explanation_index.tolist())
+        ]
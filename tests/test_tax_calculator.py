@@ -0,0 +1,87 @@
+"""
+Tests for the slab tax calculations in tax_calculator (and the optional
+compiled tax_calc_c build)
+"""
+
+import numpy as np
+import pytest
+
+from tax_calculator import (
+    calculate_new_regime_tax,
+    calculate_new_regime_tax_vec,
+    calculate_old_regime_tax,
+    calculate_old_regime_tax_vec,
+    get_better_regime,
+)
+
+# (taxable income, base tax, cess) at and around every slab threshold
+OLD_REGIME_CASES = [
+    (0, 0, 0),
+    (250000, 0, 0),
+    (250009, 0, 0),
+    (250010, 1, 0),  # 5% of 10 = 0.5 rounds half up
+    (500000, 12500, 500),
+    (500001, 12500, 500),
+    (1000000, 112500, 4500),
+    (1000001, 112500, 4500),
+    (1500000, 262500, 10500),
+]
+
+NEW_REGIME_CASES = [
+    (0, 0, 0),
+    (300000, 0, 0),
+    (600000, 15000, 600),
+    (900000, 45000, 1800),
+    (1200000, 90000, 3600),
+    (1500000, 150000, 6000),
+    (1500001, 150000, 6000),
+    (2000000, 300000, 12000),
+    (700012, 25001, 1000),  # 10% of 100012 = 10001.2 rounds down
+]
+
+def _sample_incomes():
+    """Random taxable incomes plus every slab threshold and its neighbours"""
+    rng = np.random.default_rng(0)
+    thresholds = [250000, 300000, 500000, 600000, 900000, 1000000, 1200000, 1500000]
+    edges = [t + d for t in thresholds for d in (-1, 0, 1)]
+    return np.concatenate([rng.integers(0, 5_000_000, 5000), edges]).astype(np.int64)
+
+@pytest.mark.parametrize("income, base_tax, cess", OLD_REGIME_CASES)
+def test_old_regime_slabs(income, base_tax, cess):
+    assert calculate_old_regime_tax(income) == {
+        "base_tax": base_tax, "cess": cess, "total_tax": base_tax + cess
+    }
+
+@pytest.mark.parametrize("income, base_tax, cess", NEW_REGIME_CASES)
+def test_new_regime_slabs(income, base_tax, cess):
+    assert calculate_new_regime_tax(income) == {
+        "base_tax": base_tax, "cess": cess, "total_tax": base_tax + cess
+    }
+
+def test_amounts_are_whole_rupees():
+    result = calculate_old_regime_tax(987654)
+    assert all(type(value) is int for value in result.values())
+
+@pytest.mark.parametrize("scalar, vectorized", [
+    (calculate_old_regime_tax, calculate_old_regime_tax_vec),
+    (calculate_new_regime_tax, calculate_new_regime_tax_vec),
+])
+def test_vectorized_matches_scalar(scalar, vectorized):
+    incomes = _sample_incomes()
+    result = vectorized(incomes)
+    for i, income in enumerate(incomes.tolist()):
+        assert scalar(income) == {key: int(result[key][i]) for key in result}
+
+def test_compiled_matches_scalar():
+    tax_calc_c = pytest.importorskip("tax_calc_c")
+    for income in _sample_incomes().tolist():
+        assert tax_calc_c.calculate_old_regime_tax(income) == calculate_old_regime_tax(income)
+        assert tax_calc_c.calculate_new_regime_tax(income) == calculate_new_regime_tax(income)
+
+def test_better_regime():
+    old_regime_tax = calculate_old_regime_tax(1000000)
+    new_regime_tax = calculate_new_regime_tax(1200000)
+    assert get_better_regime(old_regime_tax, new_regime_tax) == {
+        "regime": "New Regime",
+        "savings": old_regime_tax["total_tax"] - new_regime_tax["total_tax"],
+    }
@@ -0,0 +1,112 @@
+"""
+Tests for the regime predictor: the ratio rule, and the legacy Decision Tree
+served through its compiled C, Numba and generated Python backends
+"""
+
+import numpy as np
+import pytest
+
+import tax_predictor
+from tax_predictor import FEATURES, TaxRegimePredictor
+
+def _profiles(tree_arrays=None, fractional=False):
+    """
+    Random taxpayer rows (columns in FEATURES order), plus rows on both
+    sides of every split threshold of a packed tree
+    """
+    rng = np.random.default_rng(0)
+    n = 3000
+    rows = np.column_stack([
+        rng.integers(300000, 2500000, n),
+        rng.integers(0, 150000, n),
+        rng.integers(0, 50000, n),
+        rng.integers(0, 200000, n),
+        rng.integers(0, 300000, n),
+        rng.integers(0, 100000, n),
+        rng.integers(22, 70, n),
+    ]).astype(np.float64)
+    if tree_arrays is not None:
+        feature, threshold, left, _ = tree_arrays
+        edges = []
+        for node in np.flatnonzero(left != -1):
+            for value in (threshold[node], threshold[node] + 1):
+                row = rows[len(edges)].copy()
+                row[feature[node]] = value
+                edges.append(row)
+        rows = np.vstack([rows, edges])
+    if fractional:
+        rows = rows + rng.uniform(-1, 1, rows.shape)
+    return rows
+
+@pytest.fixture(scope="module")
+def model_cache(tmp_path_factory):
+    """Keep the pickled model and compiled tree libraries out of the repo"""
+    return tmp_path_factory.mktemp("model") / "tax_predictor.pkl"
+
+@pytest.fixture(params=["c", "numba", "python"])
+def legacy(request, model_cache, monkeypatch):
+    """Legacy predictor with one tree backend forced"""
+    pytest.importorskip("sklearn")
+    monkeypatch.setattr(tax_predictor, "_MODEL_CACHE", model_cache)
+    monkeypatch.setattr(TaxRegimePredictor, "_shared_model", None)
+    if request.param != "c":
+        monkeypatch.setattr(TaxRegimePredictor, "_compile_c_model", staticmethod(lambda *args: None))
+    if request.param == "python":
+        monkeypatch.setattr(tax_predictor, "_compile_walk", lambda: None)
+    
+    predictor = TaxRegimePredictor(legacy_ml=True)
+    shared = predictor._shared
+    if request.param == "c" and shared.c_predict is None:
+        pytest.skip("no C compiler")
+    if request.param == "numba" and shared.walk is None:
+        pytest.skip("Numba is not installed")
+    return predictor
+
+def _sklearn_reference(model, rows):
+    """Regime and confidence from sklearn itself on whole-rupee inputs"""
+    features = np.rint(rows).astype(np.float32)
+    classes = model.predict(features)
+    probability = model.predict_proba(features)
+    confidence = probability[np.arange(len(rows)), np.searchsorted(model.classes_, classes)] * 100
+    return [tax_predictor._REGIME_LABELS[c] for c in classes.tolist()], confidence
+
+def test_tree_predicts_both_regimes(legacy):
+    X, _ = TaxRegimePredictor._generate_training_data()
+    assert set(legacy.model.predict(X).tolist()) == {0, 1}
+
+@pytest.mark.parametrize("fractional", [False, True])
+def test_backend_matches_sklearn(legacy, fractional):
+    rows = _profiles(legacy._shared.tree_arrays, fractional)
+    regimes, confidence = _sklearn_reference(legacy.model, rows)
+    for row, regime, expected in zip(rows.tolist(), regimes, confidence.tolist()):
+        result = legacy.predict_regime(*row)
+        assert result["regime"] == regime
+        assert result["confidence"] == pytest.approx(expected)
+
+@pytest.mark.parametrize("fractional", [False, True])
+def test_batch_matches_sklearn_and_scalar(legacy, fractional):
+    rows = _profiles(legacy._shared.tree_arrays, fractional)
+    regimes, confidence = _sklearn_reference(legacy.model, rows)
+    batch = legacy.predict_regime_batch(rows)
+    assert [result["regime"] for result in batch] == regimes
+    assert [result["confidence"] for result in batch] == pytest.approx(confidence.tolist())
+    assert batch == [legacy.predict_regime(*row) for row in rows.tolist()]
+
+def test_ratio_rule_batch_matches_scalar():
+    predictor = TaxRegimePredictor(legacy_ml=False)
+    rows = _profiles(fractional=True)
+    assert predictor.predict_regime_batch(rows) == [predictor.predict_regime(*row) for row in rows.tolist()]
+
+def test_ratio_rule_regimes():
+    predictor = TaxRegimePredictor(legacy_ml=False)
+    assert predictor.predict_regime(2000000, 0, 0, 0, 0, 0)["regime"] == "New Regime"
+    assert predictor.predict_regime(1000000, 150000, 25000, 100000, 0, 0)["regime"] == "Old Regime"
+
+@pytest.mark.parametrize("rows", [
+    [1] * (2 * len(FEATURES)),
+    [[1] * (len(FEATURES) - 1)] * 2,
+    [[[1] * len(FEATURES)]],
+])
+def test_batch_rejects_wrong_shape(rows):
+    with pytest.raises(ValueError):
+        TaxRegimePredictor(legacy_ml=False).predict_regime_batch(rows)